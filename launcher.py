@@ -5,18 +5,11 @@ LogOn Launcher - Starts the session manager and Streamlit app
 
 import subprocess
 import sys
-import time
-import threading
 from session_manager import session_manager
 
 def start_streamlit():
     """Start the Streamlit app"""
-    try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "streamlit_app.py", "--server.port", "6001"])
-    except KeyboardInterrupt:
-        print("\nShutting down Streamlit...")
-    except Exception as e:
-        print(f"Error starting Streamlit: {e}")
+    return subprocess.Popen([sys.executable, "-m", "streamlit", "run", "streamlit_app.py", "--server.port", "6001"])
 
 def main():
     print("🚀 Starting LogOn System...")
@@ -25,10 +18,14 @@ def main():
     print("📊 Starting Session Manager...")
     session_manager.start_monitoring()
     
-    # Start Streamlit in a separate thread
+    # Start Streamlit as a child process; the main thread just waits on it
     print("🌐 Starting Streamlit Dashboard...")
-    streamlit_thread = threading.Thread(target=start_streamlit, daemon=True)
-    streamlit_thread.start()
+    try:
+        streamlit_proc = start_streamlit()
+    except Exception as e:
+        print(f"Error starting Streamlit: {e}")
+        session_manager.stop_all_sessions()
+        return
     
     try:
         print("✅ LogOn System is running!")
@@ -36,12 +33,20 @@ def main():
         print("📊 Session monitoring is active")
         print("\nPress Ctrl+C to stop...")
         
-        # Keep main thread alive
-        while True:
-            time.sleep(1)
+        streamlit_proc.wait()
             
     except KeyboardInterrupt:
+        pass
+    finally:
+        # SessionManager's SIGINT/SIGTERM handler exits via SystemExit, and
+        # Streamlit may also exit on its own, so shut down on every path
         print("\n🛑 Shutting down LogOn System...")
+        if streamlit_proc.poll() is None:
+            streamlit_proc.terminate()
+            try:
+                streamlit_proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                streamlit_proc.kill()
         session_manager.stop_all_sessions()
         print("✅ LogOn System stopped.")
 
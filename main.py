@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import time
+import functools
 import threading
 import subprocess
 from datetime import datetime
@@ -11,28 +12,61 @@ from rich.prompt import Prompt
 from rich.text import Text
 import termios
 import tty
-import select
+import selectors
+
+# Prefer orjson for verticals.json when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 VERTICALS_FILE = 'verticals.json'
 LOGGER_DIR = 'logger_data'
 AUTO_END_SECONDS = 20*60  # 20 minutes
+NATIVE_SELECT_MAX = 20  # above this many verticals, select with fzf
+
+# Parsed verticals.json, keyed on the file's mtime
+_VERT_CACHE = {"mtime": None, "data": None}
+# pygame mixer is initialised on first use and then reused
+_mixer_ready = False
+# logger_data only needs creating once per run
+_log_dir_ready = False
 
 console = Console()
 
 # Ensure logger_data directory exists
 def ensure_logger_dir():
-    Path(LOGGER_DIR).mkdir(exist_ok=True)
+    global _log_dir_ready
+    if not _log_dir_ready:
+        Path(LOGGER_DIR).mkdir(exist_ok=True)
+        _log_dir_ready = True
+
+def _json_loads(data):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _json_dumps(obj):
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
 
 def load_verticals():
     if not os.path.exists(VERTICALS_FILE):
-        with open(VERTICALS_FILE, 'w') as f:
-            json.dump(["Project AI Data Agent"], f)
-    with open(VERTICALS_FILE, 'r') as f:
-        return json.load(f)
+        Path(VERTICALS_FILE).write_bytes(_json_dumps(["Project AI Data Agent"]))
+    # Only re-parse verticals.json when it has changed on disk
+    mtime = os.stat(VERTICALS_FILE).st_mtime_ns
+    if _VERT_CACHE["mtime"] != mtime:
+        _VERT_CACHE["data"] = tuple(_json_loads(Path(VERTICALS_FILE).read_bytes()))
+        _VERT_CACHE["mtime"] = mtime
+    return list(_VERT_CACHE["data"])
 
 def save_verticals(verticals):
-    with open(VERTICALS_FILE, 'w') as f:
-        json.dump(verticals, f, indent=2)
+    Path(VERTICALS_FILE).write_bytes(_json_dumps(verticals))
+    # We just wrote the file, so seed the cache instead of re-reading it
+    _VERT_CACHE["data"] = tuple(verticals)
+    _VERT_CACHE["mtime"] = os.stat(VERTICALS_FILE).st_mtime_ns
 
 def add_vertical(name):
     verticals = load_verticals()
@@ -44,6 +78,14 @@ def add_vertical(name):
         console.print(f"[yellow]Vertical already exists:[/] {name}")
 
 def select_vertical(verticals):
+    # Short lists are quicker to pick by number than through an fzf process
+    if len(verticals) <= NATIVE_SELECT_MAX:
+        for i, vertical in enumerate(verticals, start=1):
+            console.print(f"[cyan]{i:>2}[/] {vertical}")
+        choices = [str(i) for i in range(1, len(verticals) + 1)]
+        choice = Prompt.ask("Select vertical (Enter to exit)", choices=choices,
+                            default="", show_choices=False, show_default=False)
+        return verticals[int(choice) - 1] if choice else ""
     try:
         proc = subprocess.Popen(
             ['fzf', '--height', '40%', '--border', '--prompt=Select vertical: '],
@@ -68,41 +110,72 @@ def multiline_input(prompt):
 def beep():
     print('\a', end='', flush=True)
 
+def _ensure_mixer():
+    # Initialising the mixer is slow, so do it once and keep it for later beeps
+    global _mixer_ready
+    import pygame
+    if not _mixer_ready:
+        pygame.mixer.init()
+        _mixer_ready = True
+    return pygame
+
 def play_mp3(path):
     try:
-        import pygame
-        pygame.mixer.init()
+        pygame = _ensure_mixer()
         pygame.mixer.music.load(path)
         pygame.mixer.music.play()
         # Wait for the music to finish
         while pygame.mixer.music.get_busy():
             time.sleep(0.1)
-        pygame.mixer.quit()
     except Exception as e:
         print(f"[ERROR] Could not play mp3: {e}")
 
+@functools.lru_cache(maxsize=None)
 def log_file_path(vertical):
     safe_name = vertical.replace('/', '_').replace(' ', '_')
     return os.path.join(LOGGER_DIR, f"{safe_name}.txt")
 
-def write_log(vertical, line):
+@functools.lru_cache(maxsize=None)
+def heartbeat_file_path(vertical):
+    safe_name = vertical.replace('/', '_').replace(' ', '_')
+    return os.path.join(LOGGER_DIR, f"{safe_name}.inprogress")
+
+def append_log(vertical, line, log_fh=None):
+    # The main log is append-only; pass the session handle when one is open
+    if log_fh is not None:
+        log_fh.write(line + '\n')
+        return
     ensure_logger_dir()
-    path = log_file_path(vertical)
-    # If 'in progress', replace previous 'in progress' line for this vertical
-    if 'in progress' in line:
-        if os.path.exists(path):
-            with open(path, 'r') as f:
-                lines = f.readlines()
-            # Remove previous 'in progress' lines
-            lines = [l for l in lines if 'in progress' not in l]
-        else:
-            lines = []
-        lines.append(line + '\n')
-        with open(path, 'w') as f:
-            f.writelines(lines)
-    else:
-        with open(path, 'a') as f:
-            f.write(line + '\n')
+    with open(log_file_path(vertical), 'a') as f:
+        f.write(line + '\n')
+
+def flush_heartbeat(vertical, log_fh):
+    # Copy the last heartbeat into the main log so migrate_data can still
+    # recover the duration of a session that never wrote a close line
+    try:
+        line = Path(heartbeat_file_path(vertical)).read_text().strip()
+    except FileNotFoundError:
+        return
+    if line:
+        append_log(vertical, line, log_fh)
+
+def open_heartbeat(vertical, log_fh):
+    ensure_logger_dir()
+    # A sidecar left over from a killed session is kept before truncating it
+    flush_heartbeat(vertical, log_fh)
+    return os.open(heartbeat_file_path(vertical), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+def update_heartbeat(hb_fd, time_str):
+    # The line never gets shorter during a session, so one pwrite over
+    # the previous line replaces it without a truncate
+    os.pwrite(hb_fd, f"[LogOn - {time_str}] in progress\n".encode(), 0)
+
+def clear_heartbeat(vertical, hb_fd):
+    os.close(hb_fd)
+    try:
+        os.remove(heartbeat_file_path(vertical))
+    except FileNotFoundError:
+        pass
 
 def getch():
     fd = sys.stdin.fileno()
@@ -116,12 +189,26 @@ def getch():
 
 def timer_loop(vertical, goal, start_time):
     start_line = f"{start_time} [ {vertical} ] : Start logging Goal: {goal}"
-    write_log(vertical, start_line)
+    ensure_logger_dir()
+    # Keep one append handle open for the whole session
+    log_fh = open(log_file_path(vertical), 'a', buffering=1)
+    hb_fd = open_heartbeat(vertical, log_fh)
+    append_log(vertical, start_line, log_fh)
+    # Set once a closed/auto-closed line is logged; otherwise the last
+    # heartbeat is copied into the log on the way out
+    closed = False
     print(f"\rLogOn: Task [ {vertical} ] 00:00:00\033[K", end='', flush=True)
     fd = sys.stdin.fileno()
     old_settings = termios.tcgetattr(fd)
     start_ts = time.time()
     last_logged_second = -1
+    # The status line is written as raw bytes; only the time in the middle changes
+    status_prefix = f"\rLogOn: Task [ {vertical} ] ".encode()
+    status_suffix = b"\033[K"
+    last_rendered = b''
+    # Register stdin once; each wait is a single epoll call on Linux
+    key_selector = selectors.DefaultSelector()
+    key_selector.register(sys.stdin, selectors.EVENT_READ)
     try:
         tty.setcbreak(fd)
         while True:
@@ -130,26 +217,30 @@ def timer_loop(vertical, goal, start_time):
                 mins, secs = divmod(elapsed, 60)
                 hours, mins = divmod(mins, 60)
                 time_str = f"{hours:02}:{mins:02}:{secs:02}"
-                print(f"\rLogOn: Task [ {vertical} ] {time_str}\033[K", end='', flush=True)
+                # Only write (and flush) when the visible text has changed
+                rendered = status_prefix + time_str.encode() + status_suffix
+                if rendered != last_rendered:
+                    os.write(sys.stdout.fileno(), rendered)
+                    last_rendered = rendered
                 # Log in progress every 5 seconds
                 if elapsed != 0 and elapsed % 5 == 0:
-                    write_log(vertical, f"[LogOn - {time_str}] in progress")
+                    update_heartbeat(hb_fd, time_str)
                 # Auto end after 20 minutes
                 if elapsed >= AUTO_END_SECONDS:
-                    write_log(vertical, f"[LogOn - {time_str}] auto-closed after 20 minutes")
+                    append_log(vertical, f"[LogOn - {time_str}] auto-closed after 20 minutes", log_fh)
+                    closed = True
                     print(f"\n[cyan]Session auto-closed at {time_str} (20 minutes reached).[/]")
                     play_mp3("/home/ajay-dev/Documents/HangOn/LogOn/beep.mp3")
                     break
                 last_logged_second = elapsed
-            # Non-blocking key check
-            dr, _, _ = select.select([sys.stdin], [], [], 0.1)
-            if dr:
+            # Block until a key arrives or the next whole second is due
+            timeout = max(0.0, start_ts + elapsed + 1 - time.time())
+            if key_selector.select(timeout):
+                # time_str is still current: it was rendered for this elapsed value
                 ch = sys.stdin.read(1)
-                mins, secs = divmod(elapsed, 60)
-                hours, mins = divmod(mins, 60)
-                time_str = f"{hours:02}:{mins:02}:{secs:02}"
                 if ch == 'q':
-                    write_log(vertical, f"[LogOn - {time_str}] closed")
+                    append_log(vertical, f"[LogOn - {time_str}] closed", log_fh)
+                    closed = True
                     print(f"\n[cyan]Session closed at {time_str}.[/]")
                     break
                 elif ch == 'h':
@@ -161,16 +252,22 @@ def timer_loop(vertical, goal, start_time):
                     tty.setcbreak(fd)  # Set back to cbreak mode
                     # Adjust start_ts forward by hold duration to pause timer
                     start_ts += (hold_end - hold_start)
-                    write_log(vertical, f"[LogOn - {time_str}] NOTE: {note}")
+                    append_log(vertical, f"[LogOn - {time_str}] NOTE: {note}", log_fh)
     except KeyboardInterrupt:
         elapsed = int(time.time() - start_ts)
         mins, secs = divmod(elapsed, 60)
         hours, mins = divmod(mins, 60)
         time_str = f"{hours:02}:{mins:02}:{secs:02}"
-        write_log(vertical, f"[LogOn - {time_str}] closed")
+        append_log(vertical, f"[LogOn - {time_str}] closed", log_fh)
+        closed = True
         print(f"\n[cyan]Timer interrupted. Session closed at {time_str}.[/]")
     finally:
         termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        key_selector.close()
+        if not closed:
+            flush_heartbeat(vertical, log_fh)
+        log_fh.close()
+        clear_heartbeat(vertical, hb_fd)
 
 def main():
     ensure_logger_dir()
@@ -9,6 +9,41 @@ import csv
 import re
 from datetime import datetime, timedelta
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# Legacy log line patterns, compiled once
+START_PATTERN = re.compile(r"(\d{2}:\d{2}) (\w{3}) (\d{1,2}) (\w{3}) (\d{4}) \[ (.*?) \] : Start logging Goal: (.*)")
+DURATION_PATTERN = re.compile(r"\[LogOn - (\d{2}):(\d{2}):(\d{2})\]")
+START_MARKER = ' ] : Start logging Goal: '
+MONTHS = {name: number for number, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'], start=1)}
+
+def match_start_line(line):
+    """Split a session start line into its START_PATTERN groups, or return None"""
+    # Lines written by main.py have fixed columns: "HH:MM Ddd DD Mon YYYY [ "
+    if (len(line) > 24 and line[2] == ':' and line[5] == ' ' and line[9] == ' '
+            and line[12] == ' ' and line[16] == ' ' and line[21:24] == ' [ '
+            and line[0:2].isdecimal() and line[3:5].isdecimal() and line[10:12].isdecimal()
+            and line[17:21].isdecimal() and line[6:9].isalpha() and line[13:16].isalpha()):
+        marker = line.find(START_MARKER, 24)
+        if marker != -1:
+            return (line[0:5], line[6:9], line[10:12], line[13:16], line[17:21],
+                    line[24:marker], line[marker + len(START_MARKER):])
+    # The regex needs the start marker too, so most lines can skip it outright
+    if START_MARKER not in line:
+        return None
+    # Anything else (e.g. single-digit days) goes through the regex
+    start_match = START_PATTERN.match(line)
+    return start_match.groups() if start_match else None
+
+def match_duration(line):
+    """Return (hours, minutes, seconds) from a "[LogOn - HH:MM:SS]" line, or None"""
+    if (line.startswith('[LogOn - ') and line[11:12] == ':' and line[14:15] == ':'
+            and line[17:18] == ']' and line[9:11].isdecimal()
+            and line[12:14].isdecimal() and line[15:17].isdecimal()):
+        return int(line[9:11]), int(line[12:14]), int(line[15:17])
+    duration_match = DURATION_PATTERN.search(line)
+    return tuple(map(int, duration_match.groups())) if duration_match else None
 
 def parse_legacy_log_file(file_path, project_name):
     """Parse individual legacy log file and return structured data"""
@@ -16,69 +51,68 @@ def parse_legacy_log_file(file_path, project_name):
     
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        current_session = None
-        last_duration = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+            current_session = None
+            # Elapsed seconds from the session's latest "[LogOn - HH:MM:SS]" line
+            last_duration_sec = 0
             
-            # Check for session start
-            start_pattern = re.compile(r"(\d{2}:\d{2}) (\w{3}) (\d{1,2}) (\w{3}) (\d{4}) \[ (.*?) \] : Start logging Goal: (.*)")
-            start_match = start_pattern.match(line)
-            
-            if start_match:
-                # Save previous session if exists
-                if current_session:
-                    if last_duration:
-                        total_minutes = last_duration.total_seconds() / 60
-                        current_session['duration_minutes'] = round(total_minutes, 2)
-                    else:
-                        current_session['duration_minutes'] = 0
-                    sessions.append(current_session)
+            # Iterate the file directly so only one line is held at a time
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
                 
-                # Start new session
-                time_str, day_name, day, month, year, project, goal = start_match.groups()
-                last_duration = None
+                # Check for session start
+                start_match = match_start_line(line)
                 
-                # Create datetime object
-                date_str = f"{day} {month} {year}"
-                datetime_str = f"{date_str} {time_str}"
-                start_datetime = datetime.strptime(datetime_str, '%d %b %Y %H:%M')
+                if start_match:
+                    # Save previous session if exists
+                    if current_session:
+                        if last_duration_sec:
+                            current_session['duration_minutes'] = round(last_duration_sec / 60, 2)
+                        else:
+                            current_session['duration_minutes'] = 0
+                        sessions.append(current_session)
+                    
+                    # Start new session
+                    time_str, day_name, day, month, year, project, goal = start_match
+                    last_duration_sec = 0
+                    
+                    # Create datetime object directly instead of re-parsing with strptime;
+                    # %b matches month names in any case, so look them up the same way
+                    month_number = MONTHS.get(month.title())
+                    if month_number is not None:
+                        start_datetime = datetime(int(year), month_number, int(day),
+                                                  int(time_str[0:2]), int(time_str[3:5]))
+                    else:
+                        start_datetime = datetime.strptime(f"{day} {month} {year} {time_str}", '%d %b %Y %H:%M')
+                    
+                    current_session = {
+                        'start_time': start_datetime,
+                        'end_time': None,
+                        'project': project,
+                        'goal': goal,
+                        'status': 'closed',  # Assume closed since we're migrating
+                        'session_type': 'manual',  # Assume manual for legacy data
+                        'auto_closed': False
+                    }
                 
-                current_session = {
-                    'start_time': start_datetime,
-                    'end_time': None,
-                    'project': project,
-                    'goal': goal,
-                    'status': 'closed',  # Assume closed since we're migrating
-                    'session_type': 'manual',  # Assume manual for legacy data
-                    'auto_closed': False
-                }
+                # Check for duration entries
+                elif current_session and "[LogOn -" in line:
+                    duration_match = match_duration(line)
+                    
+                    if duration_match:
+                        h, m, s = duration_match
+                        last_duration_sec = h * 3600 + m * 60 + s
+                    
+                    # Check for session end
+                    if 'closed' in line or 'auto-closed' in line:
+                        current_session['auto_closed'] = 'auto-closed' in line
             
-            # Check for duration entries
-            elif current_session and "[LogOn -" in line:
-                duration_pattern = re.compile(r"\[LogOn - (\d{2}):(\d{2}):(\d{2})\]")
-                duration_match = duration_pattern.search(line)
-                
-                if duration_match:
-                    h, m, s = map(int, duration_match.groups())
-                    duration = timedelta(hours=h, minutes=m, seconds=s)
-                    last_duration = duration
-                
-                # Check for session end
-                if 'closed' in line or 'auto-closed' in line:
-                    current_session['auto_closed'] = 'auto-closed' in line
-        
         # Add last session
         if current_session:
-            if last_duration:
-                total_minutes = last_duration.total_seconds() / 60
-                current_session['duration_minutes'] = round(total_minutes, 2)
-                current_session['end_time'] = current_session['start_time'] + last_duration
+            if last_duration_sec:
+                current_session['duration_minutes'] = round(last_duration_sec / 60, 2)
+                current_session['end_time'] = current_session['start_time'] + timedelta(seconds=last_duration_sec)
             else:
                 current_session['duration_minutes'] = 0
             sessions.append(current_session)
@@ -88,6 +122,11 @@ def parse_legacy_log_file(file_path, project_name):
     
     return sessions
 
+def parse_legacy_log_job(job):
+    """Parse one (log_file_path, project) pair; used as a process pool task"""
+    log_file_path, project = job
+    return parse_legacy_log_file(log_file_path, project)
+
 def migrate_legacy_data():
     """Migrate all legacy log files to CSV format"""
     
@@ -106,24 +145,33 @@ def migrate_legacy_data():
     
     all_sessions = []
     
-    # Process each vertical's log file
+    # Collect each vertical's log file
+    jobs = []
     for project in verticals:
         filename = project.replace(' ', '_') + '.txt'
         log_file_path = f"logger_data/{filename}"
         
         if os.path.exists(log_file_path):
             print(f"Processing {log_file_path}...")
-            sessions = parse_legacy_log_file(log_file_path, project)
-            
-            # Add session IDs
-            for i, session in enumerate(sessions):
-                session['session_id'] = f"migrated_{project}_{i}_{int(session['start_time'].timestamp())}"
-                all_sessions.append(session)
-            
-            print(f"  Found {len(sessions)} sessions")
+            jobs.append((log_file_path, project))
         else:
             print(f"  No log file found for {project}")
     
+    # Log files are independent, so parse them in parallel when there are several
+    if len(jobs) > 1:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(parse_legacy_log_job, jobs))
+    else:
+        results = [parse_legacy_log_job(job) for job in jobs]
+    
+    for (log_file_path, project), sessions in zip(jobs, results):
+        # Add session IDs
+        for i, session in enumerate(sessions):
+            session['session_id'] = f"migrated_{project}_{i}_{int(session['start_time'].timestamp())}"
+            all_sessions.append(session)
+        
+        print(f"  Found {len(sessions)} sessions in {log_file_path}")
+    
     # Sort sessions by start time
     all_sessions.sort(key=lambda x: x['start_time'])
     
@@ -136,8 +184,8 @@ def migrate_legacy_data():
                 'project', 'goal', 'session_type', 'status', 'auto_closed'
             ])
             
-            for session in all_sessions:
-                writer.writerow([
+            writer.writerows([
+                [
                     session['session_id'],
                     session['start_time'].isoformat(),
                     session['end_time'].isoformat() if session['end_time'] else '',
@@ -147,7 +195,9 @@ def migrate_legacy_data():
                     session['session_type'],
                     session['status'],
                     session['auto_closed']
-                ])
+                ]
+                for session in all_sessions
+            ])
         
         print(f"\n✅ Migration complete!")
         print(f"📊 Migrated {len(all_sessions)} sessions to {csv_file}")
@@ -1,6 +1,12 @@
 import csv
 from datetime import datetime
 from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+# Date plus optional time, ignoring microseconds and any UTC offset
+ISO_CORE_PATTERN = r'^(\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2})?)?)(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?$'
 
 
 def normalize_iso_seconds(dt_str: str) -> str:
@@ -24,6 +30,17 @@ def normalize_iso_seconds(dt_str: str) -> str:
             return dt_str
 
 
+def normalize_iso_column(values: List[str]) -> List[str]:
+    # Parse the common forms in one pass; anything else goes through fromisoformat
+    col = pd.Series(values, dtype=object)
+    core = col.str.extract(ISO_CORE_PATTERN, expand=False)
+    parsed = pd.to_datetime(core, errors='coerce', format='ISO8601')
+    out = parsed.dt.strftime('%Y-%m-%dT%H:%M:%S').astype(object)
+    missed = out.isna()
+    out[missed] = col[missed].map(normalize_iso_seconds)
+    return out.tolist()
+
+
 def normalize_csv(csv_path: Path) -> None:
     if not csv_path.exists():
         print(f"CSV not found: {csv_path}")
@@ -47,16 +64,13 @@ def normalize_csv(csv_path: Path) -> None:
         print("Header missing 'start_time' or 'end_time'; aborting.")
         return
 
-    # Normalize times
-    for i in range(1, len(rows)):
-        row = rows[i]
-        if not row:
-            continue
-        if len(row) <= max(start_idx, end_idx):
-            continue
-        row[start_idx] = normalize_iso_seconds(row[start_idx])
-        row[end_idx] = normalize_iso_seconds(row[end_idx])
-        rows[i] = row
+    # Normalize times, skipping blank and short rows
+    targets = [row for row in rows[1:] if row and len(row) > max(start_idx, end_idx)]
+    if targets:
+        for idx in (start_idx, end_idx):
+            normalized = normalize_iso_column([row[idx] for row in targets])
+            for row, value in zip(targets, normalized):
+                row[idx] = value
 
     # Write back
     with csv_path.open('w', newline='', encoding='utf-8') as f:
@@ -70,5 +84,3 @@ if __name__ == '__main__':
     base_dir = Path(__file__).parent.resolve()
     csv_file = base_dir / 'logger_data' / 'sessions.csv'
     normalize_csv(csv_file)
-
-
@@ -1,6 +1,6 @@
 import re
 import csv
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 # Input log file path
 log_file = "/home/ajay-dev/Documents/HangOn/LogOn/logger_data/Project_AI_Data_Agent.txt"
@@ -28,7 +28,6 @@ with open(log_file, "r") as f:
                 rows.append(current_entry)
 
             time_str, day_name, day, month, year, project, goal = start_match.groups()
-            start_datetime = datetime.strptime(f"{day} {month} {year} {time_str}", "%d %b %Y %H:%M")
 
             current_entry = {
                 "date": f"{day} {month} {year}",
@@ -3,7 +3,11 @@ import json
 import time
 import threading
 import subprocess
+import logging
 import csv
+import io
+import heapq
+import itertools
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from pathlib import Path
@@ -11,10 +15,80 @@ from typing import Dict, List, Optional, Tuple
 import signal
 import sys
 
+# Prefer orjson for verticals.json when it is installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# All session times are kept in IST; build the zone once
+IST = ZoneInfo('Asia/Kolkata')
+# Process id used in session ids; fixed for the life of the process
+_PID = os.getpid()
+
+
+class _TimeoutScheduler:
+    """Runs callbacks at monotonic deadlines from one shared background thread"""
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap = []  # (deadline, token, callback)
+        self._live = set()
+        self._tokens = itertools.count(1)
+        self._thread = None
+    
+    def schedule(self, delay: float, callback) -> int:
+        """Run callback(token) after delay seconds; returns the token for cancel()"""
+        with self._cond:
+            token = next(self._tokens)
+            heapq.heappush(self._heap, (time.monotonic() + delay, token, callback))
+            self._live.add(token)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='session-timeouts', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return token
+    
+    def cancel(self, token: Optional[int]):
+        """Cancel a scheduled callback (no-op if it already ran)"""
+        with self._cond:
+            self._live.discard(token)
+            self._cond.notify()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    # Drop cancelled entries at the head of the heap
+                    while self._heap and self._heap[0][1] not in self._live:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                _, token, callback = heapq.heappop(self._heap)
+                self._live.discard(token)
+            try:
+                # The callback gets its own token so it can tell whether it is stale
+                callback(token)
+            except Exception:
+                logger.exception("Error in session timeout")
+
+
 class SessionManager:
     def __init__(self):
+        # current_session is copy-on-write: writers (holding session_lock) publish
+        # a new dict instead of mutating it, so status reads need no lock
         self.current_session = None
         self.session_lock = threading.Lock()
+        # Serializes changes to sessions.csv; held without session_lock so file
+        # I/O never blocks pause/resume/status
+        self._csv_lock = threading.Lock()
         base_dir = Path(__file__).parent.resolve()
         self.csv_file = str((base_dir / "logger_data" / "sessions.csv").resolve())
         self.verticals_file = str((base_dir / "verticals.json").resolve())
@@ -22,6 +96,10 @@ class SessionManager:
         self.manual_timeout = 20 * 60  # 20 minutes
         self.running = False
         self.screen_monitor_thread = None
+        # One scheduler thread serves every session timeout
+        self._timeouts = _TimeoutScheduler()
+        # Byte offset of each row appended by this process, keyed by session_id
+        self._row_offsets = {}
         
         # Ensure directories exist
         Path(self.csv_file).parent.mkdir(exist_ok=True)
@@ -29,8 +107,10 @@ class SessionManager:
         # Initialize CSV file if it doesn't exist
         self._init_csv_file()
         
-        # Load verticals
-        self.verticals = self._load_verticals()
+        # Load verticals (a dict used as an insertion-ordered set); reloaded
+        # whenever verticals.json's mtime changes
+        self._verticals_mtime = -1
+        self._refresh_verticals()
         
         # Setup signal handlers for graceful shutdown (only in main thread)
         try:
@@ -45,12 +125,12 @@ class SessionManager:
         """Format datetime as ISO without microseconds and without timezone offset, in IST."""
         if dt is None:
             return ''
-        if dt.tzinfo is None:
-            # Assume naive is already local time; just drop microseconds
-            return dt.replace(microsecond=0).isoformat()
-        # Convert to IST, strip tzinfo
-        ist = dt.astimezone(ZoneInfo('Asia/Kolkata')).replace(microsecond=0)
-        return ist.replace(tzinfo=None).isoformat()
+        # Naive times are assumed to be local already; aware ones are converted
+        # to IST unless they were created there
+        if dt.tzinfo is not None and dt.tzinfo is not IST:
+            dt = dt.astimezone(IST)
+        # Build YYYY-MM-DDTHH:MM:SS directly, which also drops microseconds
+        return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
@@ -70,19 +150,37 @@ class SessionManager:
     def _load_verticals(self) -> List[str]:
         """Load verticals from JSON file"""
         try:
-            with open(self.verticals_file, 'r') as f:
-                return json.load(f)
+            data = Path(self.verticals_file).read_bytes()
         except FileNotFoundError:
             return ["systemOn"]
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
+    
+    def _refresh_verticals(self):
+        """Reload verticals if verticals.json changed on disk (e.g. via main.py)"""
+        try:
+            mtime = os.stat(self.verticals_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._verticals_mtime:
+            self._verticals = dict.fromkeys(self._load_verticals())
+            self._verticals_tuple = tuple(self._verticals)
+            self._verticals_mtime = mtime
     
     def _save_verticals(self):
         """Save verticals to JSON file"""
-        with open(self.verticals_file, 'w') as f:
-            json.dump(self.verticals, f, indent=2)
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(list(self._verticals), option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(list(self._verticals), indent=2).encode()
+        Path(self.verticals_file).write_bytes(data)
+        self._verticals_tuple = tuple(self._verticals)
+        self._verticals_mtime = os.stat(self.verticals_file).st_mtime_ns
     
     def _generate_session_id(self) -> str:
         """Generate unique session ID"""
-        return f"session_{int(time.time())}_{os.getpid()}"
+        return f"session_{time.time_ns() // 1_000_000_000}_{_PID}"
     
     def _detect_screen_lock(self) -> bool:
         """Detect if screen is locked (Linux specific)"""
@@ -95,15 +193,6 @@ class SessionManager:
         except (subprocess.TimeoutExpired, FileNotFoundError):
             pass
         
-        try:
-            # Alternative method using loginctl
-            result = subprocess.run(['loginctl', 'show-session', '$(loginctl | grep $(whoami) | awk "{print $1}")', '-p', 'Active'], 
-                                  capture_output=True, text=True, timeout=5)
-            if 'Active=no' in result.stdout:
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
         return False
     
     def _monitor_screen_lock(self):
@@ -125,8 +214,8 @@ class SessionManager:
                 last_lock_status = is_locked
                 time.sleep(2)  # Check every 2 seconds
                 
-            except Exception as e:
-                print(f"Error monitoring screen lock: {e}")
+            except Exception:
+                logger.exception("Error monitoring screen lock")
                 time.sleep(5)
     
     def _on_screen_locked(self):
@@ -148,8 +237,8 @@ class SessionManager:
             for session in reversed(sessions):
                 if session['status'] == 'in_progress':
                     return session
-        except Exception as e:
-            print(f"Error reading sessions: {e}")
+        except Exception:
+            logger.exception("Error reading sessions")
         
         return None
     
@@ -160,22 +249,32 @@ class SessionManager:
             start_time = datetime.fromisoformat(session_data['start_time'])
             # If naive, localize to IST; if aware, convert to IST
             if start_time.tzinfo is None:
-                start_time = start_time.replace(tzinfo=ZoneInfo('Asia/Kolkata'))
+                start_time = start_time.replace(tzinfo=IST)
             else:
-                start_time = start_time.astimezone(ZoneInfo('Asia/Kolkata'))
+                start_time = start_time.astimezone(IST)
         else:
-            start_time = datetime.now(ZoneInfo('Asia/Kolkata'))
+            start_time = datetime.now(IST)
+        # Map the wall-clock start onto the monotonic clock used for durations
+        elapsed = max(timedelta(0), datetime.now(IST) - start_time)
+        start_ns = time.monotonic_ns() - int(elapsed.total_seconds() * 1e9)
             
         self.current_session = {
             'id': session_data['session_id'],
             'start_time': start_time,
+            # Display values never change during a session, so build them once
+            'start_str': start_time.strftime('%H:%M:%S'),
+            'start_epoch': int(start_time.timestamp()),
+            'start_ns': start_ns,
             'project': session_data['project'],
             'goal': session_data['goal'],
             'type': session_data['session_type'],
-            'timeout_thread': None
+            'timeout_token': None,
+            'paused': False,
+            'paused_start_ns': None,
+            'total_paused_ns': 0
         }
         
-        # Start timeout thread if it's a manual session
+        # Schedule timeout if it's a manual session
         if session_data['session_type'] == 'manual':
             self._start_manual_timeout()
     
@@ -194,103 +293,127 @@ class SessionManager:
         """Start a new session"""
         session_id = self._generate_session_id()
         # Use timezone-aware IST timestamps for both memory and CSV
-        start_time = datetime.now(ZoneInfo('Asia/Kolkata'))
+        start_time = datetime.now(IST)
         
         self.current_session = {
             'id': session_id,
             'start_time': start_time,
+            # Display values never change during a session, so build them once
+            'start_str': start_time.strftime('%H:%M:%S'),
+            'start_epoch': int(start_time.timestamp()),
+            # Durations are measured on the monotonic clock; start_time is for display/CSV
+            'start_ns': time.monotonic_ns(),
             'project': project,
             'goal': goal,
             'type': session_type,
-            'timeout_thread': None,
+            'timeout_token': None,
             'paused': False,
-            'paused_start': None,
-            'total_paused_duration': timedelta(0)  # Track total time paused
+            'paused_start_ns': None,
+            'total_paused_ns': 0  # Track total time paused
         }
         
         # Write to CSV
         self._write_session_to_csv(session_id, start_time, None, 0, project, goal, session_type, 'in_progress', False)
         
-        # Start timeout thread for manual sessions
+        # Schedule timeout for manual sessions
         if session_type == 'manual':
             self._start_manual_timeout()
         
         return True
     
     def _start_manual_timeout(self):
-        """Start timeout thread for manual sessions"""
-        if self.current_session and self.current_session['timeout_thread'] is None:
-            self.current_session['timeout_thread'] = threading.Timer(
+        """Schedule the timeout for manual sessions"""
+        if self.current_session and self.current_session['timeout_token'] is None:
+            token = self._timeouts.schedule(
                 self.manual_timeout, 
                 self._manual_timeout_callback
             )
-            self.current_session['timeout_thread'].start()
+            self.current_session = {**self.current_session, 'timeout_token': token}
+    
+    def _active_ns(self, session: Dict, now_ns: int) -> int:
+        """Active (unpaused) time of a session in nanoseconds"""
+        paused_ns = session['total_paused_ns']
+        # If currently paused, include the ongoing paused period
+        if session['paused'] and session['paused_start_ns'] is not None:
+            paused_ns += now_ns - session['paused_start_ns']
+        return max(0, now_ns - session['start_ns'] - paused_ns)
     
-    def _manual_timeout_callback(self):
+    def _manual_timeout_callback(self, token: int):
         """Callback for manual session timeout"""
         with self.session_lock:
-            if self.current_session and self.current_session['type'] == 'manual':
-                self._end_current_session("Manual session timeout (20 minutes)")
+            if not (self.current_session and self.current_session['type'] == 'manual'):
+                return
+            # A timeout popped just before a pause, or before a stop and a new
+            # start, no longer belongs to the current session
+            if self.current_session['timeout_token'] != token:
+                return
+            session = self._detach_current_session()
+        self._end_session(session, "Manual session timeout (20 minutes)")
     
-    def _end_current_session(self, reason: str = "Manual stop"):
-        """End the current session"""
-        if not self.current_session:
-            return
+    def _detach_current_session(self) -> Optional[Dict]:
+        """Clear the current session and cancel its timeout (caller holds session_lock)"""
+        session = self.current_session
+        if not session:
+            return None
         
-        # Cancel timeout thread if exists
-        if self.current_session['timeout_thread']:
-            self.current_session['timeout_thread'].cancel()
+        # Cancel pending timeout if exists
+        if session['timeout_token'] is not None:
+            self._timeouts.cancel(session['timeout_token'])
         
+        self.current_session = None
+        return session
+    
+    def _end_session(self, session: Dict, reason: str = "Manual stop"):
+        """Record a detached session as closed (no session_lock needed)"""
         # Calculate duration excluding paused time
-        end_time = datetime.now(ZoneInfo('Asia/Kolkata'))
-        total_duration = end_time - self.current_session['start_time']
-        paused_total = self.current_session.get('total_paused_duration', timedelta(0))
-        # If currently paused, include the ongoing paused period
-        if self.current_session.get('paused') and self.current_session.get('paused_start'):
-            paused_total += (end_time - self.current_session['paused_start'])
-        active_duration = total_duration - paused_total
-        if active_duration.total_seconds() < 0:
-            active_duration = timedelta(0)
-        duration_minutes = active_duration.total_seconds() / 60
+        duration_minutes = self._active_ns(session, time.monotonic_ns()) / 60e9
+        end_time = datetime.now(IST)
         
         # Update CSV
         self._update_session_in_csv(
-            self.current_session['id'],
+            session['id'],
             end_time,
             duration_minutes,
             'closed',
             reason == "Manual session timeout (20 minutes)"
         )
-        
-        self.current_session = None
     
     def pause_session(self) -> bool:
         """Pause current session"""
         with self.session_lock:
-            if self.current_session and not self.current_session['paused']:
-                self.current_session['paused'] = True
-                self.current_session['paused_start'] = datetime.now(ZoneInfo('Asia/Kolkata'))
+            session = self.current_session
+            if session and not session['paused']:
                 # Cancel timeout when paused
-                if self.current_session['timeout_thread']:
-                    self.current_session['timeout_thread'].cancel()
+                if session['timeout_token'] is not None:
+                    self._timeouts.cancel(session['timeout_token'])
+                self.current_session = {
+                    **session,
+                    'paused': True,
+                    'paused_start_ns': time.monotonic_ns(),
+                    'timeout_token': None
+                }
                 return True
             return False
     
     def resume_session(self) -> bool:
         """Resume paused session"""
         with self.session_lock:
-            if self.current_session and self.current_session['paused']:
+            session = self.current_session
+            if session and session['paused']:
                 # Calculate paused duration and add to total
-                if self.current_session['paused_start']:
-                    pause_end = datetime.now(ZoneInfo('Asia/Kolkata'))
-                    paused_duration = pause_end - self.current_session['paused_start']
-                    self.current_session['total_paused_duration'] += paused_duration
+                total_paused_ns = session['total_paused_ns']
+                if session['paused_start_ns'] is not None:
+                    total_paused_ns += time.monotonic_ns() - session['paused_start_ns']
                 
-                self.current_session['paused'] = False
-                self.current_session['paused_start'] = None
+                self.current_session = {
+                    **session,
+                    'paused': False,
+                    'paused_start_ns': None,
+                    'total_paused_ns': total_paused_ns
+                }
                 
                 # Restart timeout for manual sessions
-                if self.current_session['type'] == 'manual':
+                if session['type'] == 'manual':
                     self._start_manual_timeout()
                 
                 return True
@@ -299,10 +422,11 @@ class SessionManager:
     def stop_current_session(self) -> bool:
         """Stop current session (called from Streamlit UI)"""
         with self.session_lock:
-            if self.current_session:
-                self._end_current_session("Manual stop")
-                return True
+            session = self._detach_current_session()
+        if session is None:
             return False
+        self._end_session(session, "Manual stop")
+        return True
     
     def stop_auto_session(self) -> bool:
         """Auto sessions disabled"""
@@ -312,112 +436,155 @@ class SessionManager:
         """Stop all sessions and cleanup"""
         self.running = False
         with self.session_lock:
-            if self.current_session:
-                self._end_current_session("System shutdown")
+            session = self._detach_current_session()
+        if session is not None:
+            self._end_session(session, "System shutdown")
         
         if self.screen_monitor_thread and self.screen_monitor_thread.is_alive():
             self.screen_monitor_thread.join(timeout=5)
     
     def get_current_session_status(self) -> Optional[Dict]:
         """Get current session status for UI"""
-        with self.session_lock:
-            if self.current_session:
-                # Ensure both times are timezone-aware for calculation
-                now = datetime.now(ZoneInfo('Asia/Kolkata'))
-                start_time = self.current_session['start_time']
-                total_duration = now - start_time
-                paused_total = self.current_session.get('total_paused_duration', timedelta(0))
-                # If paused, include current paused span in paused_total for display
-                if self.current_session.get('paused') and self.current_session.get('paused_start'):
-                    paused_total += (now - self.current_session['paused_start'])
-                active_duration = total_duration - paused_total
-                if active_duration.total_seconds() < 0:
-                    active_duration = timedelta(0)
-                effective_elapsed_seconds = int(active_duration.total_seconds())
-                return {
-                    'id': self.current_session['id'],
-                    'project': self.current_session['project'],
-                    'goal': self.current_session['goal'],
-                    'type': self.current_session['type'],
-                    'start_time': start_time.strftime('%H:%M:%S'),
-                    'duration_minutes': round(active_duration.total_seconds() / 60, 1),
-                    'start_epoch': int(start_time.timestamp()),
-                    'paused': bool(self.current_session.get('paused', False)),
-                    'effective_elapsed': effective_elapsed_seconds,
-                    'status': 'running'
-                }
+        # Read the published snapshot once; writers never mutate it, so no lock
+        session = self.current_session
+        if session:
+            # Elapsed time comes from the monotonic clock; no timezone math needed
+            active_ns = self._active_ns(session, time.monotonic_ns())
+            effective_elapsed_seconds = active_ns // 1_000_000_000
+            return {
+                'id': session['id'],
+                'project': session['project'],
+                'goal': session['goal'],
+                'type': session['type'],
+                'start_time': session['start_str'],
+                'duration_minutes': round(active_ns / 60e9, 1),
+                'start_epoch': session['start_epoch'],
+                'paused': bool(session.get('paused', False)),
+                'effective_elapsed': effective_elapsed_seconds,
+                'status': 'running'
+            }
         return None
     
     def _write_session_to_csv(self, session_id: str, start_time: datetime, end_time: Optional[datetime], 
                             duration_minutes: float, project: str, goal: str, session_type: str, 
                             status: str, auto_closed: bool):
         """Write session data to CSV"""
-        try:
-            with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                # Enforce ISO format with timezone info in seconds precision
-                start_str = self._fmt_dt(start_time) if isinstance(start_time, datetime) else str(start_time)
-                end_str = self._fmt_dt(end_time) if isinstance(end_time, datetime) else ''
-                writer.writerow([
-                    session_id,
-                    start_str,
-                    end_str,
-                    round(duration_minutes, 2),
-                    project,
-                    goal,
-                    session_type,
-                    status,
-                    auto_closed
-                ])
-        except Exception as e:
-            print(f"Error writing to CSV: {e}")
+        with self._csv_lock:
+            try:
+                with open(self.csv_file, 'a', newline='', encoding='utf-8') as f:
+                    # Remember where the row starts so closing it only rewrites the tail
+                    self._row_offsets[str(session_id).strip()] = f.tell()
+                    writer = csv.writer(f)
+                    # Enforce ISO format with timezone info in seconds precision
+                    start_str = self._fmt_dt(start_time) if isinstance(start_time, datetime) else str(start_time)
+                    end_str = self._fmt_dt(end_time) if isinstance(end_time, datetime) else ''
+                    writer.writerow([
+                        session_id,
+                        start_str,
+                        end_str,
+                        round(duration_minutes, 2),
+                        project,
+                        goal,
+                        session_type,
+                        status,
+                        auto_closed
+                    ])
+            except Exception:
+                logger.exception("Error writing to CSV")
+    
+    def _write_csv_rows(self, f, fieldnames: List[str], rows: List[Dict]):
+        """Write rows with DictWriter, normalizing duration and auto_closed"""
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        # Ensure auto_closed is written as a boolean-compatible value
+        for r in rows:
+            # Normalize types
+            if isinstance(r.get('duration_minutes'), float):
+                r['duration_minutes'] = str(round(r['duration_minutes'], 2))
+            # Ensure auto_closed is either True/False or 'True'/'False'
+            ac = r.get('auto_closed')
+            if isinstance(ac, str):
+                r['auto_closed'] = True if ac.lower() == 'true' else False
+            writer.writerow(r)
+    
+    def _update_tail_in_csv(self, offset: int, target_id: str, updates: Dict) -> bool:
+        """Update the row starting at offset in place, rewriting only from there on"""
+        with open(self.csv_file, 'r+b') as f:
+            fieldnames = next(csv.reader([f.readline().decode('utf-8')]), None)
+            if not fieldnames or offset < f.tell():
+                return False
+            f.seek(offset)
+            tail = f.read().decode('utf-8')
+            try:
+                rows = list(csv.DictReader(io.StringIO(tail, newline=''), fieldnames=fieldnames))
+            except csv.Error:
+                return False
+            # The file may have been rewritten since the row was appended
+            if not rows or str(rows[0].get('session_id', '')).strip() != target_id:
+                return False
+            rows[0].update(updates)
+            out = io.StringIO(newline='')
+            self._write_csv_rows(out, fieldnames, rows)
+            data = out.getvalue().encode('utf-8')
+            f.seek(offset)
+            f.write(data)
+            f.truncate()
+        # Rows after this one have moved by however much the tail grew
+        delta = len(data) - len(tail.encode('utf-8'))
+        for sid, row_offset in self._row_offsets.items():
+            if row_offset > offset:
+                self._row_offsets[sid] = row_offset + delta
+        return True
     
     def _update_session_in_csv(self, session_id: str, end_time: datetime, 
                              duration_minutes: float, status: str, auto_closed: bool):
         """Update existing session in CSV"""
-        try:
-            # Read all rows as dicts
-            with open(self.csv_file, 'r', newline='', encoding='utf-8') as f:
-                dict_reader = csv.DictReader(f)
-                fieldnames = dict_reader.fieldnames or [
-                    'session_id', 'start_time', 'end_time', 'duration_minutes', 
-                    'project', 'goal', 'session_type', 'status', 'auto_closed'
-                ]
-                rows = list(dict_reader)
-
-            # Update the matching row by session_id (trimmed)
-            target_id = str(session_id).strip()
-            iso_end = self._fmt_dt(end_time)
-            updated = False
-            for row in rows:
-                if str(row.get('session_id', '')).strip() == target_id:
-                    row['end_time'] = iso_end
-                    row['duration_minutes'] = str(round(duration_minutes, 2))
-                    row['status'] = status
+        with self._csv_lock:
+            try:
+                target_id = str(session_id).strip()
+                updates = {
+                    'end_time': self._fmt_dt(end_time),
+                    'duration_minutes': str(round(duration_minutes, 2)),
+                    'status': status,
                     # Store auto_closed as literal True/False (not stringified boolean text accidentally)
-                    row['auto_closed'] = True if auto_closed else False
-                    updated = True
-                    break
+                    'auto_closed': True if auto_closed else False
+                }
+            
+                # Fast path: the row was appended by this process, so only the tail changes
+                offset = self._row_offsets.pop(target_id, None)
+                if offset is not None and self._update_tail_in_csv(offset, target_id, updates):
+                    return
+            
+                # Read all rows as dicts
+                with open(self.csv_file, 'r', newline='', encoding='utf-8') as f:
+                    dict_reader = csv.DictReader(f)
+                    fieldnames = dict_reader.fieldnames or [
+                        'session_id', 'start_time', 'end_time', 'duration_minutes', 
+                        'project', 'goal', 'session_type', 'status', 'auto_closed'
+                    ]
+                    rows = list(dict_reader)
 
-            # Write back to file via DictWriter to preserve headers and order
-            with open(self.csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                # Ensure auto_closed is written as a boolean-compatible value
-                for r in rows:
-                    # Normalize types
-                    if isinstance(r.get('duration_minutes'), float):
-                        r['duration_minutes'] = str(round(r['duration_minutes'], 2))
-                    # Ensure auto_closed is either True/False or 'True'/'False'
-                    ac = r.get('auto_closed')
-                    if isinstance(ac, str):
-                        r['auto_closed'] = True if ac.lower() == 'true' else False
-                    writer.writerow(r)
+                # Update the matching row by session_id (trimmed)
+                updated = False
+                for row in rows:
+                    if str(row.get('session_id', '')).strip() == target_id:
+                        row.update(updates)
+                        updated = True
+                        break
+
+                # Write back via DictWriter to preserve headers and order; write a
+                # temp file and swap it in so a crash never leaves a truncated CSV
+                tmp_file = self.csv_file + '.tmp'
+                with open(tmp_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                    csv.writer(f).writerow(fieldnames)
+                    self._write_csv_rows(f, fieldnames, rows)
+                os.replace(tmp_file, self.csv_file)
+                # Every row may have moved, so recorded offsets are no longer valid
+                self._row_offsets.clear()
 
-            if not updated:
-                print(f"Warning: session_id not found for update: {session_id}")
-        except Exception as e:
-            print(f"Error updating CSV: {e}")
+                if not updated:
+                    logger.warning("session_id not found for update: %s", session_id)
+            except Exception:
+                logger.exception("Error updating CSV")
     
     def get_session_history(self, limit: int = 100) -> List[Dict]:
         """Get session history for UI"""
@@ -430,8 +597,8 @@ class SessionManager:
             sessions.sort(key=lambda x: x['start_time'], reverse=True)
             return sessions[:limit]
             
-        except Exception as e:
-            print(f"Error reading session history: {e}")
+        except Exception:
+            logger.exception("Error reading session history")
             return []
     
     def start_monitoring(self):
@@ -440,15 +607,17 @@ class SessionManager:
     
     def add_vertical(self, name: str) -> bool:
         """Add a new vertical/project"""
-        if name not in self.verticals:
-            self.verticals.append(name)
+        self._refresh_verticals()
+        if name not in self._verticals:
+            self._verticals[name] = None
             self._save_verticals()
             return True
         return False
     
-    def get_verticals(self) -> List[str]:
-        """Get list of available verticals/projects"""
-        return self.verticals.copy()
+    def get_verticals(self) -> Tuple[str, ...]:
+        """Get available verticals/projects (read-only tuple)"""
+        self._refresh_verticals()
+        return self._verticals_tuple
 
 
 # Global session manager instance - lazy loaded
@@ -461,9 +630,11 @@ def get_session_manager():
         _session_manager_instance = SessionManager()
     return _session_manager_instance
 
-# For backward compatibility, create a property-like access
-class SessionManagerProxy:
-    def __getattr__(self, name):
-        return getattr(get_session_manager(), name)
-
-session_manager = SessionManagerProxy()
+# For backward compatibility, `from session_manager import session_manager`
+# still works: the first lookup creates the manager and binds it as a plain
+# module global, so later lookups never reach __getattr__ (PEP 562)
+def __getattr__(name):
+    if name == 'session_manager':
+        globals()['session_manager'] = get_session_manager()
+        return globals()['session_manager']
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,21 +2,39 @@ import streamlit as st
 import pandas as pd
 import json
 import os
+import html
+import importlib.util
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import re
 from pathlib import Path
 from session_manager import session_manager
-from streamlit.components.v1 import html
-from string import Template
+from streamlit.components.v1 import declare_component
 
-# Try to import plotly, but make it optional
-try:
-    import plotly.express as px
-    import plotly.graph_objects as go
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+# plotly is optional; only probe for it here and import it when the graph is built
+PLOTLY_AVAILABLE = importlib.util.find_spec('plotly') is not None
+
+SESSIONS_CSV = "logger_data/sessions.csv"
+# The only sessions.csv columns the dashboard reads; the rest are never parsed
+SESSIONS_CSV_COLUMNS = ('start_time', 'duration_minutes', 'project', 'goal', 'session_type', 'status')
+# Columns that are always free text in sessions.csv
+SESSIONS_CSV_DTYPES = {'project': str, 'goal': str, 'session_type': str, 'status': str}
+
+# Rows per page in the session history table
+HISTORY_PAGE_SIZE = 200
+# Goal characters shown per row in the session history table
+GOAL_PREVIEW_CHARS = 80
+
+# Display formats for the typed columns of the session history table
+SESSION_COLUMN_CONFIG = {
+    'Date & Time': st.column_config.DatetimeColumn(format='DD MMM YYYY HH:mm'),
+    'Duration': st.column_config.NumberColumn(format='%.1f min'),
+}
+
+# Live session duration / tab title ticker (static frontend, no build step)
+duration_timer = declare_component(
+    "duration_timer", path=str(Path(__file__).parent / "frontend" / "duration_timer")
+)
 
 # Page configuration
 st.set_page_config(
@@ -46,27 +64,6 @@ st.markdown("""
         background-color: #f0f8ff;
         border-left: 4px solid #2e8b57;
     }
-    /* Center align Date & Time column */
-    .dataframe th:nth-child(1),
-    .dataframe td:nth-child(1) {
-        text-align: center !important;
-    }
-    /* Left align Total Minutes column */
-    .dataframe th:nth-child(4),
-    .dataframe td:nth-child(4) {
-        text-align: left !important;
-    }
-    /* Left align all project breakdown columns */
-    .dataframe th:nth-child(2),
-    .dataframe td:nth-child(2),
-    .dataframe th:nth-child(3),
-    .dataframe td:nth-child(3),
-    .dataframe th:nth-child(4),
-    .dataframe td:nth-child(4),
-    .dataframe th:nth-child(5),
-    .dataframe td:nth-child(5) {
-        text-align: left !important;
-    }
     /* Consistent info-like box for custom fields */
     .info-box {
         background-color: #1f2d3d; /* dark blue similar to st.info */
@@ -86,10 +83,6 @@ def create_session_controls():
     """Create session control interface"""
     st.subheader("🎮 Session Controls")
     
-    # Initialize session manager if not running
-    if not session_manager.running:
-        session_manager.start_monitoring()
-    
     # Get current session status
     current_session = session_manager.get_current_session_status()
     
@@ -98,77 +91,35 @@ def create_session_controls():
     with col1:
         st.markdown("**Current Session Status**")
         if current_session:
-            st.success(f"👤 {current_session['type'].title()} Session Active")
-            st.info(f"**Project:** {current_session['project']}")
-            st.info(f"**Goal:** {current_session['goal']}")
-            st.info(f"**Started:** {current_session['start_time']}")
-
-            # Duration in the same UI style as others, with live-updatable span
+            # Initial duration text; the ticker component keeps the span live
             now_seconds = int(datetime.now(ZoneInfo('Asia/Kolkata')).timestamp())
             elapsed = max(0, now_seconds - int(current_session.get('start_epoch', 0)))
             mm = str(elapsed // 60).zfill(2)
             ss = str(elapsed % 60).zfill(2)
-            st.markdown(f"**Duration:** <span id=\"duration-display\">{mm}:{ss}</span>", unsafe_allow_html=True)
-            start_epoch = int(current_session.get('start_epoch', 0))
-            paused_flag = 1 if bool(current_session.get('paused', False)) else 0
-            effective_elapsed = int(current_session.get('effective_elapsed', 0))
-            script = Template(
-                """
-                <script>
-                (function() {
-                  const startEpoch = $start_epoch;
-                  const baseTitle = 'LogOn ';
-                  const pausedInit = $paused_flag === 1;
-                  const effectiveInit = $effective_elapsed; // seconds
-                  // Derive a base epoch for effective elapsed time when running
-                  let baseEffectiveEpoch = Math.floor(Date.now()/1000) - effectiveInit;
-                  // Persist pause state across script reloads
-                  try { window.parent.__logonPaused = pausedInit; } catch(e){}
-                  try { window.parent.__logonEffective = effectiveInit; } catch(e){}
-                  function fmtSeconds(totalSeconds){
-                    const mm = String(Math.floor(totalSeconds/60)).padStart(2,'0');
-                    const ss = String(totalSeconds%60).padStart(2,'0');
-                    return mm + ':' + ss;
-                  }
-                  function tick(){
-                    if(!startEpoch) return;
-                    const isPaused = !!(window.parent && window.parent.__logonPaused);
-                    let sec;
-                    if (isPaused) {
-                      sec = (window.parent && typeof window.parent.__logonEffective === 'number') ? window.parent.__logonEffective : effectiveInit;
-                    } else {
-                      const now = Math.floor(Date.now()/1000);
-                      sec = Math.max(0, now - baseEffectiveEpoch);
-                      try { window.parent.__logonEffective = sec; } catch(e){}
-                    }
-                    const text = fmtSeconds(sec);
-                    const el = window.parent.document.getElementById('duration-display');
-                    if (el) { el.textContent = text; }
-                    try { window.parent.document.title = '⏱ ' + text + ' - ' + baseTitle; } catch(e){}
-                  }
-                  tick();
-                  // Always reset the timer on re-render to avoid stale closures
-                  try { if (window.parent.__logonTimer) { clearInterval(window.parent.__logonTimer); } } catch(e){}
-                  window.parent.__logonTimer = setInterval(tick, 1000);
-                })();
-                </script>
-                """
-            ).substitute(start_epoch=start_epoch, paused_flag=paused_flag, effective_elapsed=effective_elapsed)
-            html(script, height=0)
+            # One info box for the whole status, so the frontend inserts a single element
+            goal_html = html.escape(str(current_session['goal'])).replace('\n', '<br>')
+            st.markdown(
+                f'<div class="info-box">'
+                f'👤 <strong>{html.escape(current_session["type"].title())} Session Active</strong><br>'
+                f'<strong>Project:</strong> {html.escape(str(current_session["project"]))}<br>'
+                f'<strong>Goal:</strong> {goal_html}<br>'
+                f'<strong>Started:</strong> {html.escape(str(current_session["start_time"]))}<br>'
+                f'<strong>Duration:</strong> <span id="duration-display">{mm}:{ss}</span>'
+                f'</div>',
+                unsafe_allow_html=True,
+            )
+            # The ticker component stays mounted across reruns; only its props change
+            duration_timer(
+                start_epoch=int(current_session.get('start_epoch', 0)),
+                paused=bool(current_session.get('paused', False)),
+                effective=int(current_session.get('effective_elapsed', 0)),
+                key="duration_timer",
+                default=None,
+            )
         else:
             st.warning("No active session")
-            # Reset tab title when no session
-            html(
-                """
-                <script>
-                (function(){
-                  try { if (window.parent.__logonTimer) { clearInterval(window.parent.__logonTimer); window.parent.__logonTimer = null; } } catch(e){}
-                  try { window.parent.document.title = 'LogOn Dashboard'; } catch(e){}
-                })();
-                </script>
-                """,
-                height=0,
-            )
+            # A zero start_epoch stops the ticker and resets the tab title
+            duration_timer(start_epoch=0, paused=False, effective=0, key="duration_timer", default=None)
     
     with col2:
         st.markdown("**Manual Session Controls**")
@@ -217,16 +168,17 @@ def create_session_controls():
                     else:
                         st.error("Failed to stop session")
 
-def create_daily_hours_graph(df):
-    """Create a line graph showing daily total hours"""
+@st.cache_data(max_entries=1)
+def create_daily_hours_graph(_df, csv_mtime):
+    """Create a line graph showing daily total hours, cached per CSV version"""
+    # _df is not hashed by Streamlit; csv_mtime identifies the data it came from
     if not PLOTLY_AVAILABLE:
         return None
         
-    if df.empty:
+    if _df.empty:
         return None
     
-    # Use the passed dataframe directly (it now contains both original and display columns)
-    raw_df = df.copy()
+    raw_df = _df.copy()
     
     # Convert datetime columns
     if 'start_time' in raw_df.columns:
@@ -234,15 +186,16 @@ def create_daily_hours_graph(df):
     if 'duration_minutes' in raw_df.columns:
         raw_df['duration_minutes'] = pd.to_numeric(raw_df['duration_minutes'], errors='coerce')
     
-    # Group by IST date and sum duration in hours
-    daily_data = raw_df.groupby(raw_df['start_time'].dt.tz_convert('Asia/Kolkata').dt.date)['duration_minutes'].sum() / 60
-    daily_data = daily_data.reset_index()
-    daily_data.columns = ['date', 'total_hours']
+    # Group by IST calendar day and sum duration in hours; start_time is already
+    # in IST, and floor('D') keeps the key as datetime64 instead of date objects
+    day_key = raw_df['start_time'].dt.floor('D').dt.tz_localize(None).rename('date')
+    daily_data = raw_df.groupby(day_key)['duration_minutes'].sum().div(60).rename('total_hours').reset_index()
     
     # Sort by date
     daily_data = daily_data.sort_values('date')
     
     # Create the plotly figure
+    import plotly.graph_objects as go
     fig = go.Figure()
     
     # Add line with wave effect
@@ -304,57 +257,87 @@ def create_daily_hours_graph(df):
     
     return fig
 
-def load_session_data_from_csv():
-    """Load session data from the unified CSV file"""
-    csv_file = "logger_data/sessions.csv"
-    
-    if not os.path.exists(csv_file):
+@st.cache_data(max_entries=1)
+def load_session_data_from_csv(csv_mtime):
+    """Load session data from the unified CSV file, cached until the file changes"""
+    if csv_mtime is None:
         return pd.DataFrame()
     
     try:
-        # Use pandas read_csv with proper handling of commas in goal field
-        df = pd.read_csv(csv_file, encoding='utf-8')
+        # Use pandas read_csv with proper handling of commas in goal field;
+        # text columns are declared up front so they skip type inference
+        # start_time is parsed by the reader itself when every value is clean ISO 8601
+        df = pd.read_csv(SESSIONS_CSV, encoding='utf-8', engine='c', dtype=SESSIONS_CSV_DTYPES,
+                         usecols=lambda col: col in SESSIONS_CSV_COLUMNS,
+                         parse_dates=['start_time'], date_format='ISO8601')
         
         if df.empty:
             return df
         
         # Convert datetime columns - robust to timezone-aware or naive strings
         if 'start_time' in df.columns:
-            start_parsed = pd.to_datetime(df['start_time'], errors='coerce')
+            start_parsed = df['start_time']
+            # Left as text when a value failed to parse (e.g. mixed offsets); coerce those to NaT
+            if not pd.api.types.is_datetime64_any_dtype(start_parsed):
+                start_parsed = pd.to_datetime(start_parsed, errors='coerce')
             if start_parsed.dt.tz is None:
                 df['start_time'] = start_parsed.dt.tz_localize('Asia/Kolkata')
             else:
                 df['start_time'] = start_parsed.dt.tz_convert('Asia/Kolkata')
-        if 'end_time' in df.columns:
-            # Handle empty end_time values for in_progress sessions
-            end_parsed = pd.to_datetime(df['end_time'], errors='coerce')
-            if end_parsed.notna().any():
-                if end_parsed.dt.tz is None:
-                    df['end_time'] = end_parsed.dt.tz_localize('Asia/Kolkata')
-                else:
-                    df['end_time'] = end_parsed.dt.tz_convert('Asia/Kolkata')
         # Convert duration_minutes to numeric, handling any string values
         if 'duration_minutes' in df.columns:
-            df['duration_minutes'] = pd.to_numeric(df['duration_minutes'], errors='coerce')
+            duration = df['duration_minutes']
+            # read_csv already gives float64 unless a stray non-numeric value is present
+            if not pd.api.types.is_numeric_dtype(duration):
+                duration = pd.to_numeric(duration, errors='coerce')
             # Fill NaN duration values with 0 for in_progress sessions
-            df['duration_minutes'] = df['duration_minutes'].fillna(0)
+            df['duration_minutes'] = duration.fillna(0)
+        
+        # Only a handful of distinct values, so hold them as categories
+        for col in ('session_type', 'status'):
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
+        # Filter keys, normalised once per load; as categories the filter
+        # equality compares integer codes rather than strings
+        df['_project_norm'] = df['project'].astype(str).str.strip().astype('category')
+        df['_type_norm'] = df['session_type'].astype(str).str.strip().str.lower().astype('category')
         
         # Sort by start_time in descending order (latest to oldest)
         df = df.sort_values('start_time', ascending=False)
         
-        # Create display columns while preserving original columns
-        df['Date & Time'] = df['start_time'].dt.strftime('%d %b %Y %H:%M')
-        df['Duration'] = df['duration_minutes'].apply(lambda x: f"{x:.1f} min" if pd.notna(x) else "0.0 min")
-        df['Status'] = df['status'].str.replace('_', ' ').str.title()
-        df['Type'] = df['session_type'].str.title()
-        df['Project'] = df['project']
-        df['Goal'] = df['goal']
-        
         return df
     except Exception as e:
         st.error(f"Error loading session data: {e}")
         return pd.DataFrame()
 
+@st.cache_data(max_entries=1)
+def load_filter_options(_df, csv_mtime):
+    """Return the project and type filter choices, cached per CSV version"""
+    projects = ['All'] + sorted(_df['project'].unique().tolist())
+    session_types = ['All'] + sorted(_df['session_type'].drop_duplicates().str.title().unique().tolist())
+    return projects, session_types
+
+def build_display_df(raw_df):
+    """Build the session history table's display columns for the given rows"""
+    # Date and duration stay typed; SESSION_COLUMN_CONFIG formats them in the browser
+    return pd.DataFrame({
+        'Date & Time': raw_df['start_time'],
+        'Project': raw_df['project'],
+        'Goal': raw_df['goal'],
+        'Duration': raw_df['duration_minutes'],  # NaNs are filled with 0 on load
+        # Both are categorical, so the labels are built once per category
+        'Type': raw_df['session_type'].map(str.title, na_action='ignore'),
+        'Status': raw_df['status'].map(lambda s: s.replace('_', ' ').title(), na_action='ignore'),
+    })
+
+@st.cache_data(max_entries=1)
+def export_csv_bytes(_display_df, csv_mtime, filters):
+    """Serialise the filtered sessions for download, cached per CSV version and filters"""
+    # The download keeps the "N min" duration text the table used to show
+    export_df = _display_df.assign(Duration=_display_df['Duration'].round(1).astype(str) + ' min')
+    return export_df.to_csv(index=False, date_format='%d %b %Y %H:%M').encode('utf-8')
+
 def main():
     # Header
     st.markdown('<h1 class="main-header">Logon</h1>', unsafe_allow_html=True)
@@ -365,34 +348,26 @@ def main():
     # Load session data from CSV
     st.subheader("📈 Session Data")
     
-    df = load_session_data_from_csv()
+    # The file's mtime is the cache key, so a rerun only re-reads it after a write
+    csv_mtime = os.stat(SESSIONS_CSV).st_mtime_ns if os.path.exists(SESSIONS_CSV) else None
+    df = load_session_data_from_csv(csv_mtime)
     
     
     if not df.empty:
-        # Use the loaded dataframe directly (it now contains both original and display columns)
-        raw_df = df.copy()
-        if 'start_time' in raw_df.columns:
-            # Parse any stored timezone info; if naive, localize to IST
-            parsed = pd.to_datetime(raw_df['start_time'], errors='coerce')
-            # If timezone-naive, assign IST; otherwise convert to IST
-            if parsed.dt.tz is None:
-                raw_df['start_time'] = parsed.dt.tz_localize('Asia/Kolkata')
-            else:
-                raw_df['start_time'] = parsed.dt.tz_convert('Asia/Kolkata')
-        if 'duration_minutes' in raw_df.columns:
-            raw_df['duration_minutes'] = pd.to_numeric(raw_df['duration_minutes'], errors='coerce')
+        # start_time and duration_minutes are already typed by the loader;
+        # filtering below builds new frames, so no copy is needed here
+        raw_df = df
         
         # Add filters
+        projects, session_types = load_filter_options(df, csv_mtime)
         col1, col2, col3 = st.columns(3)
         
         with col1:
             # Project filter
-            projects = ['All'] + sorted(df['Project'].unique().tolist())
             selected_project = st.selectbox("Filter by Project", projects)
             
         with col2:
             # Session type filter
-            session_types = ['All'] + sorted(df['Type'].unique().tolist())
             selected_type = st.selectbox("Filter by Type", session_types)
             
         with col3:
@@ -409,36 +384,29 @@ def main():
             else:
                 date_range = None
         
-        # Apply filters to raw data first
-        filtered_raw_df = raw_df.copy()
+        # Build one combined mask so the frame is only indexed once
+        mask = pd.Series(True, index=raw_df.index)
         if selected_project != 'All':
             # Normalize project comparison to avoid hidden whitespace/case issues
-            filtered_raw_df = filtered_raw_df[
-                filtered_raw_df['project'].astype(str).str.strip() == str(selected_project).strip()
-            ]
+            mask &= raw_df['_project_norm'] == str(selected_project).strip()
         
         if selected_type != 'All':
             # Normalize type comparison (case/whitespace) to match values like 'auto'
-            filtered_raw_df = filtered_raw_df[
-                filtered_raw_df['session_type'].astype(str).str.strip().str.lower() == selected_type.strip().lower()
-            ]
+            mask &= raw_df['_type_norm'] == selected_type.strip().lower()
         
         if date_range and len(date_range) == 2:
             # Convert selected dates to timezone-aware timestamps in Asia/Kolkata
             start_date = pd.Timestamp(date_range[0], tz='Asia/Kolkata')
             # Include full end day by moving to next day start and using '<'
             end_date_exclusive = pd.Timestamp(date_range[1], tz='Asia/Kolkata') + pd.Timedelta(days=1)
-            filtered_raw_df = filtered_raw_df[
-                (filtered_raw_df['start_time'] >= start_date) &
-                (filtered_raw_df['start_time'] < end_date_exclusive)
-            ]
+            mask &= (raw_df['start_time'] >= start_date) & (raw_df['start_time'] < end_date_exclusive)
+        
+        filtered_raw_df = raw_df[mask]
         
         # Create display dataframe from filtered raw data
         if not filtered_raw_df.empty:
-            # The display columns are already created in the load_session_data_from_csv function
-            # Just select the display columns
-            display_columns = ['Date & Time', 'Project', 'Goal', 'Duration', 'Type', 'Status']
-            filtered_df = filtered_raw_df[display_columns].copy()
+            # Display strings are only built for the rows that survived the filters
+            filtered_df = build_display_df(filtered_raw_df)
         else:
             filtered_df = pd.DataFrame()
         
@@ -446,10 +414,17 @@ def main():
         st.subheader("📊 Summary Statistics")
         col1, col2, col3, col4 = st.columns(4)
         
+        # One per-project groupby feeds both the summary metrics and the breakdown;
+        # dropna=False keeps rows without a project in the totals
+        project_stats = filtered_raw_df.groupby('project', dropna=False)['duration_minutes'].agg(['sum', 'mean', 'count'])
+        
         # Use the already filtered raw data for calculations
         if not filtered_raw_df.empty:
+            # Durations have no NaNs after load, so the group sums add up to the total
+            total_minutes = project_stats['sum'].sum()
+            session_count = len(filtered_raw_df)
+            
             with col1:
-                total_minutes = filtered_raw_df['duration_minutes'].sum()
                 st.metric("Total Time (minutes)", f"{total_minutes:.1f}")
             
             with col2:
@@ -457,16 +432,15 @@ def main():
                 st.metric("Total Time (hours)", f"{total_hours:.1f}")
             
             with col3:
-                avg_time = filtered_raw_df['duration_minutes'].mean()
+                avg_time = total_minutes / session_count
                 st.metric("Average Session (minutes)", f"{avg_time:.1f}")
             
             with col4:
-                session_count = len(filtered_raw_df)
                 st.metric("Total Sessions", session_count)
         
         # Daily Hours Graph
         st.subheader("📈 Daily Hours Trend")
-        daily_graph = create_daily_hours_graph(df)
+        daily_graph = create_daily_hours_graph(df, csv_mtime)
         if daily_graph:
             st.plotly_chart(daily_graph, use_container_width=True)
         elif not PLOTLY_AVAILABLE:
@@ -475,13 +449,11 @@ def main():
             st.info("No data available for the daily hours graph.")
         
         # Project breakdown
-        if not filtered_raw_df.empty and len(filtered_raw_df['project'].unique()) > 1:
+        if len(project_stats) > 1:
             st.subheader("📋 Project Breakdown")
             
-            # Use filtered raw data for calculations
-            breakdown_df = filtered_raw_df.groupby('project').agg({
-                'duration_minutes': ['sum', 'mean', 'count']
-            }).round(2)
+            # Reuse the per-project aggregates; the table itself lists named projects only
+            breakdown_df = project_stats[project_stats.index.notna()].round(2)
             breakdown_df.columns = ['Total Minutes', 'Avg Minutes', 'Sessions']
             
             # Add Total Hours column
@@ -492,22 +464,37 @@ def main():
             
             # Format the values for better readability
             formatted_breakdown = breakdown_df.copy()
-            formatted_breakdown['Total Minutes'] = formatted_breakdown['Total Minutes'].apply(lambda x: f"{int(x)} min")
-            formatted_breakdown['Total Hours'] = formatted_breakdown['Total Hours'].apply(lambda x: f"{x:.1f} hrs")
-            formatted_breakdown['Avg Minutes'] = formatted_breakdown['Avg Minutes'].apply(lambda x: f"{int(x)} min")
-            formatted_breakdown['Sessions'] = formatted_breakdown['Sessions'].apply(lambda x: f"{int(x)} sessions")
+            formatted_breakdown['Total Minutes'] = breakdown_df['Total Minutes'].astype(int).astype(str) + ' min'
+            # str.format, not round(1): the values are already 2-decimal, and numpy
+            # rounds ties like 6.55 differently from the f"{x:.1f}" this replaced
+            formatted_breakdown['Total Hours'] = breakdown_df['Total Hours'].map('{:.1f} hrs'.format)
+            formatted_breakdown['Avg Minutes'] = breakdown_df['Avg Minutes'].astype(int).astype(str) + ' min'
+            formatted_breakdown['Sessions'] = breakdown_df['Sessions'].astype(int).astype(str) + ' sessions'
             
             st.dataframe(formatted_breakdown, width='stretch')
         
         # Display the session data
         st.subheader("📋 Session History")
         if not filtered_df.empty:
-            st.dataframe(filtered_df, width='stretch')
+            # Only one page of rows is sent to the browser; rows are newest first
+            page_count = -(-len(filtered_df) // HISTORY_PAGE_SIZE)
+            page = 1
+            if page_count > 1:
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, step=1)
+            page_start = (page - 1) * HISTORY_PAGE_SIZE
+            page_df = filtered_df.iloc[page_start:page_start + HISTORY_PAGE_SIZE]
+            # The table shows a goal preview; the download keeps the full text
+            page_df = page_df.assign(Goal=page_df['Goal'].str.slice(0, GOAL_PREVIEW_CHARS))
+            st.dataframe(
+                page_df,
+                width='stretch',
+                column_config=SESSION_COLUMN_CONFIG,
+            )
         else:
             st.info("No sessions found matching the selected filters.")
         
-        # Download CSV option
-        csv_data = filtered_df.to_csv(index=False)
+        # Download CSV option; serialised once per CSV version and filter selection
+        csv_data = export_csv_bytes(filtered_df, csv_mtime, (selected_project, selected_type, date_range))
         st.download_button(
             label="📥 Download CSV",
             data=csv_data,